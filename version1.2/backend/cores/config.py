@@ -16,9 +16,19 @@ LLM_BASEAPI = os.getenv("LLM_BASEAPI", "")
 API_KEY = os.getenv("API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "qwen35")
 LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", 16384))
+LLM_MAX_PARALLEL = int(os.getenv("LLM_MAX_PARALLEL", "4"))
+LLM_SEGMENT_BATCH = os.getenv("LLM_SEGMENT_BATCH", "0") == "1"
+LLM_GZIP_REQUESTS = os.getenv("LLM_GZIP_REQUESTS", "0") == "1"
+LLM_MAX_IMAGE_SIDE = int(os.getenv("LLM_MAX_IMAGE_SIDE", "1536"))  # 0 disables downscaling
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "24h")  # empty string disables
+MARKDOWN_REUSE_THRESHOLD = float(os.getenv("MARKDOWN_REUSE_THRESHOLD", "0.98"))
 
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "300"))
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 SNAPSHOT_DIR = BASE_DIR / "storage" / "snapshots"
 SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = BASE_DIR / "storage" / "llm_cache.sqlite3"
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "5000"))
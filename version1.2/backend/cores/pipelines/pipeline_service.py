@@ -14,7 +14,7 @@ from PIL import Image
 from pymongo.database import Database
 
 
-from cores.config import POLL_INTERVAL, SNAPSHOT_DIR
+from cores.config import MARKDOWN_REUSE_THRESHOLD, POLL_INTERVAL, SNAPSHOT_DIR
 from .pipeline_utils import EntityExtractionNormalizer
 from utils.common import classify_value_type, clean_numeric_value, now_utc, _BOOL_TRUE_VALUES, _BOOL_FALSE_VALUES
 from utils.image_features import average_fingerprint, brightness_feature, histogram_feature, similarity_score
@@ -305,6 +305,50 @@ class PipelineService:
 
         return stats
 
+    def _reuse_near_identical_extraction(self, db: Database, group: dict, markdown: str) -> dict[str, Any] | None:
+        """Reuse the previous extraction when pass-1 markdown barely changed.
+
+        Screens are mostly static between polls, so when the fresh markdown
+        is near-identical to the last snapshot's the JSON pass would return
+        the same entities; skipping it saves the second LLM call. Set
+        MARKDOWN_REUSE_THRESHOLD to 1 or higher to disable.
+
+        Note: this only runs in the base markdown flow (the v1 router via
+        cores.pipeline), which the default v1.2 deployment does not mount —
+        PipelineServiceV2 overrides process_single_snapshot with the
+        segment pipeline, where unchanged inputs are already caught by the
+        exact image-hash check in _classify_snapshot and the per-crop LLM
+        cache. A near-identical (rather than exact) shortcut for segment
+        crops would need perceptual matching and is not attempted here.
+        """
+        if MARKDOWN_REUSE_THRESHOLD >= 1.0:
+            return None
+
+        previous = db.snapshots.find_one(
+            {"screen_group_id": group["_id"], "markdown": {"$nin": [None, ""]}},
+            sort=[("created_at", -1)],
+        )
+        if not previous:
+            return None
+
+        prev_markdown = str(previous.get("markdown") or "")
+        prev_extracted = previous.get("extracted_json")
+        if not prev_markdown or not isinstance(prev_extracted, dict):
+            return None
+        if prev_extracted.get("_parse_error") or not prev_extracted.get("entities"):
+            return None
+
+        ratio = difflib.SequenceMatcher(None, prev_markdown, markdown).ratio()
+        if ratio < MARKDOWN_REUSE_THRESHOLD:
+            return None
+
+        logger.info(
+            "Reusing previous extraction for group=%s (markdown similarity %.3f)",
+            group.get("name"),
+            ratio,
+        )
+        return prev_extracted
+
     def process_single_snapshot(self, db: Database, source: dict, monitor_key: str):
         job_id = self.create_job(db, source["_id"], monitor_key)
         self.update_job(db, job_id, "processing")
@@ -370,7 +414,7 @@ class PipelineService:
                 }
                 import json
                 schema_str = json.dumps(full_schema, ensure_ascii=False, indent=2)
-                print("Using schema for LLM extraction: \n", schema_str)
+                logger.debug("Using schema for LLM extraction:\n%s", schema_str)
 
             # OCR + Information extraction with LLM
             markdown = None
@@ -378,7 +422,12 @@ class PipelineService:
                 extracted_json = call_llm_markdown_to_json("", image_bytes, promptype='extract_from_schema_prompt', schema_str=schema_str)
             else:
                 markdown = call_llm_image_to_markdown(image_bytes)
-                extracted_json = call_llm_markdown_to_json(markdown) if markdown else {"screen_title": "", "entities": []}
+                if markdown:
+                    extracted_json = self._reuse_near_identical_extraction(db, group, markdown)
+                    if extracted_json is None:
+                        extracted_json = call_llm_markdown_to_json(markdown)
+                else:
+                    extracted_json = {"screen_title": "", "entities": []}
 
             raw_llm_json_response = extracted_json.get("_raw_response") if isinstance(extracted_json, dict) else None
             llm_parse_error = extracted_json.get("_parse_error") if isinstance(extracted_json, dict) else None
@@ -431,6 +480,18 @@ class PipelineService:
             logger.error("Snapshot failed: %s/%s: %s", source.get("name"), monitor_key, exc)
             raise
 
+    async def _process_due_source(self, db: Database, source: dict):
+        for monitor_key in source.get("monitor_keys") or ["default"]:
+            try:
+                await asyncio.to_thread(self.process_single_snapshot, db, source, monitor_key)
+            except Exception as exc:
+                logger.error("Poll error %s/%s: %s", source.get("name"), monitor_key, exc)
+                continue
+        db.kvm_sources.update_one(
+            {"_id": source["_id"]},
+            {"$set": {"last_polled_at": now_utc(), "updated_at": now_utc()}},
+        )
+
     async def poll_loop(self, db: Database, stop_event: asyncio.Event):
         cycle = 0
         while not stop_event.is_set():
@@ -443,22 +504,24 @@ class PipelineService:
 
             sources = list(db.kvm_sources.find({"enabled": True}))
             current = now_utc()
+            due_sources = []
             for source in sources:
                 poll_seconds = max(5, int(source.get("poll_seconds", POLL_INTERVAL)))
                 last_polled_at = source.get("last_polled_at")
                 due = last_polled_at is None or (current - last_polled_at) >= timedelta(seconds=poll_seconds)
-                if not due:
-                    continue
-                for monitor_key in source.get("monitor_keys") or ["default"]:
-                    try:
-                        await asyncio.to_thread(self.process_single_snapshot, db, source, monitor_key)
-                    except Exception as exc:
-                        logger.error("Poll error %s/%s: %s", source.get("name"), monitor_key, exc)
-                        continue
-                db.kvm_sources.update_one(
-                    {"_id": source["_id"]},
-                    {"$set": {"last_polled_at": now_utc(), "updated_at": now_utc()}},
-                )
+                if due:
+                    due_sources.append(source)
+
+            if due_sources:
+                # Sources are independent KVM devices, so their
+                # fetch+OCR+LLM pipelines can overlap. Monitor keys within
+                # one source stay sequential because they share the
+                # device's connect/disconnect cycle. The gather itself is
+                # deliberately unbounded: in-flight LLM requests are capped
+                # globally by the shared segment executor
+                # (pipeline_service_v2._get_segment_llm_executor), OCR by
+                # paddle_lock, and the remaining per-source work is I/O.
+                await asyncio.gather(*(self._process_due_source(db, source) for source in due_sources))
 
             try:
                 await asyncio.wait_for(stop_event.wait(), timeout=5)
@@ -6,8 +6,11 @@ import hashlib
 import io
 import json
 import logging
+import queue
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from pathlib import Path
 from typing import Any, Literal, List
@@ -27,15 +30,16 @@ from pymongo import MongoClient
 from pymongo.database import Database
 
 
-from cores.config import POLL_INTERVAL, SNAPSHOT_DIR
+from cores.config import LLM_MAX_PARALLEL, LLM_SEGMENT_BATCH, POLL_INTERVAL, SNAPSHOT_DIR
 from cores.schema_mongo import MONGO_URI
-from utils.common import classify_value_type, clean_numeric_value, now_utc, _BOOL_TRUE_VALUES, _BOOL_FALSE_VALUES
+from utils.common import classify_value_type, clean_numeric_value, coerce_numeric_pair, normalize_numeric_scalar, now_utc, _BOOL_TRUE_VALUES, _BOOL_FALSE_VALUES
 from utils.image_features import average_fingerprint, brightness_feature, histogram_feature, similarity_score, autocrop_image
 from utils.kvm_client import fetch_snapshot_bytes
 from cores.services.llm_client import (
     call_llm_image_to_markdown,
     call_llm_markdown_to_json,
     call_llm_segment,
+    call_llm_segment_batch,
     ensure_llm_name,
 )
 from cores.services.llm_client import call_llm_v2_extract
@@ -51,6 +55,29 @@ if not logger.handlers:
     ch.setFormatter(formatter)
     logger.addHandler(ch)
 
+_segment_llm_executor: ThreadPoolExecutor | None = None
+_segment_llm_executor_lock = threading.Lock()
+
+
+def _get_segment_llm_executor() -> ThreadPoolExecutor:
+    """Process-wide executor for per-segment LLM calls.
+
+    One shared bounded pool (rather than a fresh pool per snapshot) makes
+    LLM_MAX_PARALLEL a global cap on in-flight segment requests, so
+    snapshots processed concurrently cannot multiply the load on the
+    inference server — and thread pools are not rebuilt on every poll.
+    """
+    global _segment_llm_executor
+    if _segment_llm_executor is None:
+        with _segment_llm_executor_lock:
+            if _segment_llm_executor is None:
+                _segment_llm_executor = ThreadPoolExecutor(
+                    max_workers=max(1, LLM_MAX_PARALLEL),
+                    thread_name_prefix="segment-llm",
+                )
+    return _segment_llm_executor
+
+
 class PipelineServiceV2(pipeline_service.PipelineService):
     """
     V2 pipeline flow:
@@ -67,6 +94,9 @@ class PipelineServiceV2(pipeline_service.PipelineService):
         self.normalizer = pipeline_utils.EntityExtractionNormalizer()
         self._dashboard_insert_fn = None
         self._dashboard_insert_import_attempted = False
+        self._dashboard_queue: queue.Queue | None = None
+        self._dashboard_worker: threading.Thread | None = None
+        self._dashboard_worker_lock = threading.Lock()
 
     def _get_dashboard_insert_fn(self):
         if self._dashboard_insert_import_attempted:
@@ -187,24 +217,59 @@ class PipelineServiceV2(pipeline_service.PipelineService):
 
                 yield screen_id, area_id, "number", str(number)
 
+    def _ensure_dashboard_worker(self) -> queue.Queue:
+        if self._dashboard_queue is None:
+            with self._dashboard_worker_lock:
+                if self._dashboard_queue is None:
+                    self._dashboard_queue = queue.Queue(maxsize=1000)
+                    self._dashboard_worker = threading.Thread(
+                        target=self._dashboard_worker_loop,
+                        name="dashboard-push",
+                        daemon=True,
+                    )
+                    self._dashboard_worker.start()
+        return self._dashboard_queue
+
+    def _dashboard_worker_loop(self) -> None:
+        while True:
+            insert_fn, screen_id, area_id, type_value, ocr_value = self._dashboard_queue.get()
+            try:
+                insert_fn(screen_id, area_id, type_value, ocr_value)
+            except Exception as exc:
+                logger.warning(
+                    "Dashboard push failed (screen_id=%s, area_id=%s): %s",
+                    screen_id,
+                    area_id,
+                    exc,
+                )
+            finally:
+                self._dashboard_queue.task_done()
+
     def _push_ocr_result_to_dashboard(self, source: dict, snapshot: dict, entities: list[dict[str, Any]]) -> None:
+        if not entities:
+            return
+
         insert_fn = self._get_dashboard_insert_fn()
         if insert_fn is None:
             return
 
+        # Dashboard writes are per-row network calls; hand them to a
+        # background worker so the snapshot pipeline never blocks on the
+        # dashboard being slow. Rows are dropped (with a warning) rather
+        # than stalling the pipeline if the queue backs up.
+        push_queue = self._ensure_dashboard_worker()
         for screen_id, area_id, type_value, ocr_value in self._iter_dashboard_payload_rows(source, snapshot, entities):
             if ocr_value is None:
                 continue
             if isinstance(ocr_value, str) and ocr_value.strip() == "":
                 continue
             try:
-                insert_fn(screen_id, area_id, type_value, ocr_value)
-            except Exception as exc:
+                push_queue.put_nowait((insert_fn, screen_id, area_id, type_value, ocr_value))
+            except queue.Full:
                 logger.warning(
-                    "Dashboard push failed (screen_id=%s, area_id=%s): %s",
+                    "Dashboard push queue full; dropping row (screen_id=%s, area_id=%s)",
                     screen_id,
                     area_id,
-                    exc,
                 )
 
     @staticmethod
@@ -442,45 +507,10 @@ class PipelineServiceV2(pipeline_service.PipelineService):
 
     @staticmethod
     def _normalize_numeric_scalar(value: Any) -> int | float | None:
-        if value is None:
-            return None
-        if isinstance(value, bool):
-            return 1 if value else 0
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
-            f_val = float(value)
-            if not np.isfinite(f_val):
-                return None
-            return int(f_val) if f_val.is_integer() else f_val
-
-        text = str(value).strip()
-        if not text:
-            return None
-
-        lowered = text.lower()
-        if lowered == "on":
-            return 1
-        if lowered == "off":
-            return 0
-        if lowered in _BOOL_TRUE_VALUES:
-            return 1
-        if lowered in _BOOL_FALSE_VALUES:
-            return 0
-
-        parsed = clean_numeric_value(text)
-        if parsed is None:
-            return None
-
-        parsed_f = float(parsed)
-        return int(parsed_f) if parsed_f.is_integer() else parsed_f
+        return normalize_numeric_scalar(value)
 
     def _coerce_numeric_pair(self, raw_value: Any, explicit_number: Any = None, default: float = 0.0) -> tuple[int | float, str]:
-        for candidate in (explicit_number, raw_value):
-            number = self._normalize_numeric_scalar(candidate)
-            if number is not None:
-                return number, str(number)
-
-        fallback = int(default) if float(default).is_integer() else float(default)
-        return fallback, str(fallback)
+        return coerce_numeric_pair(raw_value, explicit_number, default)
 
     def _normalize_indicator_values(
         self,
@@ -1026,14 +1056,26 @@ class PipelineServiceV2(pipeline_service.PipelineService):
         image: Image.Image,
         segments: list[dict[str, Any]],
     ) -> tuple[list[dict[str, Any]], str | None]:
-        entities: list[dict[str, Any]] = []
-        parse_errors: list[str] = []
+        valid_segments = [seg for seg in segments if isinstance(seg, dict)]
+        if not valid_segments:
+            return [], None
+
+        # Each segment is an independent LLM call, so fan them out instead of
+        # serializing N round-trips. The shared executor caps in-flight
+        # requests at LLM_MAX_PARALLEL across all snapshots in flight.
+        entities: list[dict[str, Any]]
+        if LLM_SEGMENT_BATCH and len(valid_segments) > 1:
+            entities = self._extract_segments_batched(image, valid_segments)
+        elif len(valid_segments) == 1:
+            entities = [self._extract_segment_with_llm(image, valid_segments[0])]
+        else:
+            executor = _get_segment_llm_executor()
+            entities = list(
+                executor.map(lambda seg: self._extract_segment_with_llm(image, seg), valid_segments)
+            )
 
-        for seg in segments:
-            if not isinstance(seg, dict):
-                continue
-            segment_result = self._extract_segment_with_llm(image, seg)
-            entities.append(segment_result)
+        parse_errors: list[str] = []
+        for segment_result in entities:
             if segment_result.get("llm_parse_error"):
                 parse_errors.append(
                     f"{segment_result.get('segment_id')}: {segment_result.get('llm_parse_error')}"
@@ -1041,6 +1083,61 @@ class PipelineServiceV2(pipeline_service.PipelineService):
 
         return entities, (" | ".join(parse_errors) if parse_errors else None)
 
+    def _extract_segments_batched(
+        self,
+        image: Image.Image,
+        segments: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Collapse same-schema segments into one multi-image LLM request.
+
+        Segments sharing (type, columns, rows) use the same prompt, so their
+        crops can ride in a single chat completion. Singleton groups and
+        crops whose batch block comes back unusable fall back to the
+        per-segment path.
+        """
+        groups: dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[int]] = {}
+        for idx, seg in enumerate(segments):
+            key = (
+                self._normalize_object_type(seg.get("type")),
+                tuple(self._normalize_list(seg.get("columns"))),
+                tuple(self._normalize_list(seg.get("rows"))),
+            )
+            groups.setdefault(key, []).append(idx)
+
+        results: list[dict[str, Any] | None] = [None] * len(segments)
+        for (seg_type, columns_t, rows_t), indices in groups.items():
+            if len(indices) == 1:
+                idx = indices[0]
+                results[idx] = self._extract_segment_with_llm(image, segments[idx])
+                continue
+
+            columns = list(columns_t)
+            rows = list(rows_t)
+            bboxes = [self._normalize_bbox(segments[idx].get("bbox")) for idx in indices]
+            try:
+                crops = [self._crop_segment_bytes(image, bbox) for bbox in bboxes]
+                outputs = call_llm_segment_batch(crops, seg_type, columns=columns, rows=rows)
+            except Exception as exc:
+                outputs = [{"_parse_error": f"llm_exception: {exc}"} for _ in indices]
+
+            for idx, bbox, llm_out in zip(indices, bboxes, outputs):
+                if llm_out.get("_parse_error") or not llm_out:
+                    results[idx] = self._extract_segment_with_llm(image, segments[idx])
+                    continue
+                results[idx] = {
+                    "segment_id": str(segments[idx].get("id") or uuid4().hex[:8]),
+                    "type": seg_type,
+                    "name": str(segments[idx].get("name") or "").strip() or "Unnamed",
+                    "bbox": bbox,
+                    "columns": columns,
+                    "rows": rows,
+                    "value": self._build_segment_value(seg_type, columns, rows, llm_out),
+                    "raw_llm_entity": llm_out,
+                    "llm_parse_error": None,
+                }
+
+        return [row for row in results if row is not None]
+
     def _queue_unmatched_snapshot_result(
         self,
         db: Database,
@@ -1175,9 +1272,10 @@ class PipelineServiceV2(pipeline_service.PipelineService):
             logger.error("Snapshot failed: %s/%s: %s", source.get("name"), monitor_key, exc)
             raise
 
-    def _generate_layout_text(self, saved_path: Path) -> str:
+    def _generate_layout_text(self, image_source: Path | bytes) -> str:
         try:
-            return ocr.generate_layout_text(str(saved_path))
+            source = image_source if isinstance(image_source, (bytes, bytearray)) else str(image_source)
+            return ocr.generate_layout_text(source)
         except Exception as exc:
             logger.warning("Failed to generate OCR layout text: %s", exc)
             return ""
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json still works
+    orjson = None
+
+from cores.config import LLM_CACHE_ENABLED, LLM_CACHE_MAX_ROWS, LLM_CACHE_PATH
+
+logger = logging.getLogger("llm_cache")
+
+
+class LLMCache:
+    """SQLite-backed exact-match cache for deterministic LLM responses.
+
+    Keys hash the full request identity (model, prompts, image hash,
+    temperature), so a hit is only possible when the exact same request
+    would be sent again — e.g. reruns during development or repeated
+    snapshots of an unchanged screen segment. Only temperature-0 calls
+    should go through the cache; sampled outputs are not reproducible.
+    Raw response text is stored, so callers re-run their normal parsing
+    on a hit and behave identically to a fresh call.
+
+    The table is capped at max_rows entries; inserts evict the oldest
+    rows first, so a long-running poller whose screens always differ
+    slightly (clocks, counters) cannot grow the file without bound.
+    """
+
+    def __init__(self, path: Any, enabled: bool = True, max_rows: int = 0):
+        self._path = str(path)
+        self._enabled = enabled
+        self._max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, "
+                "response TEXT NOT NULL, "
+                "created_at TEXT NOT NULL DEFAULT (datetime('now')))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        if orjson is not None:
+            payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+        else:
+            payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        if not self._enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT response FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed: %s", exc)
+            return None
+        if row is None:
+            return None
+        logger.info("LLM cache hit (key=%s...)", key[:12])
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        if not self._enabled or not response:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response) VALUES (?, ?)",
+                    (key, response),
+                )
+                if self._max_rows > 0:
+                    conn.execute(
+                        "DELETE FROM llm_cache WHERE rowid NOT IN ("
+                        "SELECT rowid FROM llm_cache ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+                        (self._max_rows,),
+                    )
+                conn.commit()
+        except Exception as exc:
+            logger.warning("LLM cache store failed: %s", exc)
+
+
+llm_cache = LLMCache(LLM_CACHE_PATH, enabled=LLM_CACHE_ENABLED, max_rows=LLM_CACHE_MAX_ROWS)
@@ -1,18 +1,31 @@
 import base64
+import gzip
+import hashlib
 import io
 import json
 import logging
-import math
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 import re
+import threading
 from typing import Any
 
+import httpx
 import pandas as pd
 from openai import OpenAI
+from PIL import Image
 
-from cores.config import API_KEY, LLM_BASEAPI, LLM_MODEL, LLM_MAX_TOKENS
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json still works
+    orjson = None
+
+from cores.config import API_KEY, LLM_BASEAPI, LLM_GZIP_REQUESTS, LLM_KEEP_ALIVE, LLM_MAX_IMAGE_SIDE, LLM_MODEL, LLM_MAX_TOKENS
+from utils.common import coerce_numeric_pair
 from utils.kvm_client import request_with_log
 from . import prompts
+from .llm_cache import llm_cache
 
 
 SETTINGS_FILE = Path(__file__).resolve().parents[2] / "storage" / "settings.json"
@@ -28,6 +41,127 @@ NUMERIC_NON_LOG_REQUIREMENTS = (
 )
 
 
+_GZIP_MIN_BODY_BYTES = 16_384
+
+# Ollama applies keep_alive per request, so any completion sent without it
+# resets model residency to the server's 5-minute default — shorter than the
+# usual poll interval. Send it on every call to keep the model loaded between
+# polls; servers that do not know the field ignore it.
+_KEEP_ALIVE_EXTRA_BODY = {"keep_alive": LLM_KEEP_ALIVE} if LLM_KEEP_ALIVE else None
+
+
+class _GzipRequestTransport(httpx.HTTPTransport):
+    """Transport that gzip-compresses outgoing request bodies.
+
+    Image requests are JSON bodies dominated by base64 (4/3 the binary
+    size); gzip claws most of that overhead back, cutting upload size by
+    roughly a quarter. Opt-in via LLM_GZIP_REQUESTS because the inference
+    server must accept Content-Encoding: gzip requests.
+    """
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        if len(body) >= _GZIP_MIN_BODY_BYTES and "content-encoding" not in request.headers:
+            compressed = gzip.compress(body, compresslevel=1)
+            headers = request.headers.copy()
+            headers["content-encoding"] = "gzip"
+            headers["content-length"] = str(len(compressed))
+            request = httpx.Request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=compressed,
+                extensions=request.extensions,
+            )
+        return super().handle_request(request)
+
+
+_llm_clients: dict[tuple[str, str], OpenAI] = {}
+_llm_clients_lock = threading.Lock()
+
+
+def _get_llm_client(base_url: str, api_key: str) -> OpenAI:
+    """Return a process-wide OpenAI client for the given endpoint.
+
+    The SDK keeps an httpx connection pool per client instance, so building a
+    fresh client on every call defeats keep-alive and pays a TCP/TLS handshake
+    per request. Clients are cached by (base_url, api_key) so runtime settings
+    changes still pick up a matching client.
+    """
+    key = (base_url, api_key)
+    client = _llm_clients.get(key)
+    if client is None:
+        with _llm_clients_lock:
+            client = _llm_clients.get(key)
+            if client is None:
+                http_client = None
+                if LLM_GZIP_REQUESTS:
+                    http_client = httpx.Client(transport=_GzipRequestTransport())
+                client = OpenAI(base_url=base_url, api_key=api_key or "no-key", http_client=http_client)
+                _llm_clients[key] = client
+    return client
+
+
+_data_url_cache: OrderedDict[str, str] = OrderedDict()
+_data_url_cache_lock = threading.Lock()
+_DATA_URL_CACHE_SIZE = 8
+
+
+def _image_sha256(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def _downscale_image_bytes(image_bytes: bytes) -> bytes:
+    """Cap the long edge at LLM_MAX_IMAGE_SIDE before encoding.
+
+    The vision tower downsamples to a fixed patch grid anyway, so sending a
+    full-resolution snapshot only inflates the base64 payload and server-side
+    decode. Images already under the cap (segment crops, small monitors) pass
+    through untouched. Re-encoded as PNG to keep HMI text and line graphics
+    artifact-free.
+    """
+    if LLM_MAX_IMAGE_SIDE <= 0:
+        return image_bytes
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if max(img.size) <= LLM_MAX_IMAGE_SIDE:
+            return image_bytes
+        img.thumbnail((LLM_MAX_IMAGE_SIDE, LLM_MAX_IMAGE_SIDE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+    except Exception as exc:
+        logger.warning("Image downscale failed, sending original: %s", exc)
+        return image_bytes
+
+
+def _image_to_data_url(image_bytes: bytes, image_hash: str | None = None) -> str:
+    """Encode image bytes into a ``data:`` URL for OpenAI-style image parts.
+
+    Builds the final URL string in one pass instead of keeping a separate
+    base64 copy per call site, so peak memory holds one encoded string
+    (~1.33x the image) instead of two. Encoded URLs are memoized by content
+    hash (small LRU) so the same snapshot sent through several prompts in
+    one pipeline run is base64-encoded only once.
+    """
+    if image_hash is None:
+        image_hash = _image_sha256(image_bytes)
+
+    with _data_url_cache_lock:
+        url = _data_url_cache.get(image_hash)
+        if url is not None:
+            _data_url_cache.move_to_end(image_hash)
+            return url
+
+    url = "data:image/png;base64," + base64.b64encode(_downscale_image_bytes(image_bytes)).decode("ascii")
+    with _data_url_cache_lock:
+        _data_url_cache[image_hash] = url
+        while len(_data_url_cache) > _DATA_URL_CACHE_SIZE:
+            _data_url_cache.popitem(last=False)
+    return url
+
+
+@lru_cache(maxsize=16)
 def _normalize_openai_base_url(raw_base_url: str) -> str:
     base = str(raw_base_url or "").strip().rstrip("/")
     if not base:
@@ -44,82 +178,125 @@ def _preview_text(value: str, limit: int = 800) -> str:
     return text[:limit] + "\n...[truncated]..."
 
 
-def _normalize_numeric_scalar(value: Any) -> int | float | None:
-    from utils.common import clean_numeric_value, _BOOL_TRUE_VALUES, _BOOL_FALSE_VALUES
-
-    if value is None:
-        return None
-    if isinstance(value, bool):
-        return 1 if value else 0
-    if isinstance(value, (int, float)) and not isinstance(value, bool):
-        f_val = float(value)
-        if not math.isfinite(f_val):
-            return None
-        return int(f_val) if f_val.is_integer() else f_val
-
-    text = str(value).strip()
-    if not text:
-        return None
-
-    lowered = text.lower()
-    if lowered == "on" or lowered in _BOOL_TRUE_VALUES:
-        return 1
-    if lowered == "off" or lowered in _BOOL_FALSE_VALUES:
-        return 0
-
-    parsed = clean_numeric_value(text)
-    if parsed is None:
-        return None
-
-    parsed_f = float(parsed)
-    if not math.isfinite(parsed_f):
-        return None
-    return int(parsed_f) if parsed_f.is_integer() else parsed_f
+# Static message fragments; the content parts never change between calls,
+# so build them once instead of allocating a fresh dict per request. The
+# parts are only serialized by the client, never mutated.
+_NUMERIC_REQUIREMENTS_PART = {"type": "text", "text": NUMERIC_NON_LOG_REQUIREMENTS}
+_SCHEMA_BOOTSTRAP_PART = {
+    "type": "text",
+    "text": (
+        "SCHEMA BOOTSTRAP MODE: Infer stable entities and schema from the current screen first, "
+        "then return current values using that inferred structure."
+    ),
+}
+
+
+# Static defaults; prompt modules are constants, so build this once at import
+# instead of re-assembling the dict on every LLM call.
+_DEFAULT_LLM_SETTINGS = {
+    "llm_base_api": LLM_BASEAPI,
+    "llm_model": LLM_MODEL,
+    "api_key": API_KEY,
+    "default_image_prompt": prompts.prompt_v1.DEFAULT_IMAGE_PROMPT,
+    "markdown_to_json_prompt": prompts.prompt_v1.MARKDOWN_TO_JSON_PROMPT,
+    "extract_from_schema_prompt": prompts.prompt_v1.EXTRACT_FROM_SCHEMA_PROMPT,
+    "v2_extract_base_prompt": getattr(prompts.prompt_v2, "V2_EXTRACT_BASE_PROMPT", ""),
+    "v2_scada_prompt": getattr(prompts.prompt_v2, "V2_SCADA_OBJECT_PROMPT", ""),
+    "v2_fixed_table_prompt": getattr(prompts.prompt_v2, "V2_FIXED_TABLE_PROMPT", ""),
+    "v2_log_table_prompt": getattr(prompts.prompt_v2, "V2_LOG_TABLE_PROMPT", ""),
+    "v2_merge_prompt": getattr(prompts.prompt_v2, "V2_MERGE_PROMPT", ""),
+}
+
+_settings_file_cache: tuple[float, dict[str, Any]] | None = None
 
 
-def _coerce_numeric_pair(raw_value: Any, explicit_number: Any = None, default: float = 0.0) -> tuple[int | float, str]:
-    for candidate in (explicit_number, raw_value):
-        number = _normalize_numeric_scalar(candidate)
-        if number is not None:
-            return number, str(number)
+def _load_runtime_settings_file() -> dict[str, Any]:
+    """Read settings.json, cached by mtime so the hot path skips disk I/O."""
+    global _settings_file_cache
 
-    fallback = int(default) if float(default).is_integer() else float(default)
-    return fallback, str(fallback)
+    try:
+        mtime = SETTINGS_FILE.stat().st_mtime
+    except OSError:
+        return {}
 
+    cached = _settings_file_cache
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
 
-def _load_runtime_settings_file() -> dict[str, Any]:
-    if not SETTINGS_FILE.exists():
-        return {}
     try:
         with SETTINGS_FILE.open("r", encoding="utf-8") as f:
             data = json.load(f)
-        return data if isinstance(data, dict) else {}
+        data = data if isinstance(data, dict) else {}
     except Exception:
         return {}
 
+    _settings_file_cache = (mtime, data)
+    return data
+
 
 def _load_runtime_llm_settings() -> dict[str, str]:
-    settings = {
-        "llm_base_api": LLM_BASEAPI,
-        "llm_model": LLM_MODEL,
-        "api_key": API_KEY,
-        "default_image_prompt": prompts.prompt_v1.DEFAULT_IMAGE_PROMPT,
-        "markdown_to_json_prompt": prompts.prompt_v1.MARKDOWN_TO_JSON_PROMPT,
-        "extract_from_schema_prompt": prompts.prompt_v1.EXTRACT_FROM_SCHEMA_PROMPT,
-        "v2_extract_base_prompt": getattr(prompts.prompt_v2, "V2_EXTRACT_BASE_PROMPT", ""),
-        "v2_scada_prompt": getattr(prompts.prompt_v2, "V2_SCADA_OBJECT_PROMPT", ""),
-        "v2_fixed_table_prompt": getattr(prompts.prompt_v2, "V2_FIXED_TABLE_PROMPT", ""),
-        "v2_log_table_prompt": getattr(prompts.prompt_v2, "V2_LOG_TABLE_PROMPT", ""),
-        "v2_merge_prompt": getattr(prompts.prompt_v2, "V2_MERGE_PROMPT", ""),
-    }
+    settings = dict(_DEFAULT_LLM_SETTINGS)
     doc = _load_runtime_settings_file()
     for key in settings:
         if key in doc and doc.get(key) is not None:
             settings[key] = doc[key]
-    
+
     return settings
 
 
+@lru_cache(maxsize=64)
+def _format_segment_prompt(template: str, prompt_key: str, columns: tuple[str, ...], rows: tuple[str, ...]) -> str:
+    """Fill a segment prompt template; memoized because schemas are stable
+    across snapshots, so each (template, columns, rows) combination is
+    formatted once instead of on every segment call."""
+    if prompt_key == "v2_scada_prompt":
+        csv_rows = "\n".join([f"{label}," for label in columns])
+        return template.format(
+            indicators=", ".join(columns),
+            indicators_csv_rows=csv_rows
+        )
+    if prompt_key == "v2_fixed_table_prompt":
+        col_header = ",".join(columns)
+        row_templates = "\n".join([f"{row_name}," for row_name in rows])
+        return template.format(
+            columns=", ".join(columns),
+            rows=", ".join(rows),
+            columns_header=col_header,
+            rows_csv_template=row_templates
+        )
+    return template
+
+
+def warm_up_llm() -> bool:
+    """Send a tiny completion so the server loads the model ahead of time.
+
+    Without this the first snapshot after startup pays the multi-second
+    model load on top of its own inference latency. keep_alive asks
+    Ollama-style servers to hold the model resident; servers that do not
+    know the field ignore it.
+    """
+    settings = _load_runtime_llm_settings()
+    base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
+    if not base_url:
+        return False
+
+    client = _get_llm_client(base_url, settings["api_key"] or "")
+    try:
+        client.chat.completions.create(
+            model=settings["llm_model"],
+            messages=[{"role": "user", "content": "ping"}],
+            max_tokens=1,
+            temperature=0,
+            timeout=600,
+            extra_body=_KEEP_ALIVE_EXTRA_BODY,
+        )
+        logger.info("LLM warm-up completed for model %s", settings["llm_model"])
+        return True
+    except Exception as exc:
+        logger.warning("LLM warm-up failed: %s", exc)
+        return False
+
+
 def ensure_llm_name(markdown: str, fallback: str) -> str:
     lines = [line.strip() for line in markdown.splitlines() if line.strip()]
     for line in lines:
@@ -129,18 +306,28 @@ def ensure_llm_name(markdown: str, fallback: str) -> str:
 
 
 def call_llm_image_to_markdown(image_bytes: bytes) -> str:
+    if not image_bytes:
+        return ""
+
     settings = _load_runtime_llm_settings()
     base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
     if not base_url:
         return ""
     
-    client = OpenAI(
-        base_url=base_url,
-        api_key=settings["api_key"] or "no-key"
+    client = _get_llm_client(base_url, settings["api_key"] or "")
+
+    image_hash = _image_sha256(image_bytes)
+    cache_key = llm_cache.make_key(
+        kind="image_to_markdown",
+        model=settings["llm_model"],
+        prompt=settings["default_image_prompt"],
+        image=image_hash,
+        temperature=0,
     )
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-    
     try:
         response = client.chat.completions.create(
             model=settings["llm_model"],
@@ -149,15 +336,17 @@ def call_llm_image_to_markdown(image_bytes: bytes) -> str:
                     "role": "user",
                     "content": [
                         {"type": "text", "text": settings["default_image_prompt"]},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}},
+                        {"type": "image_url", "image_url": {"url": _image_to_data_url(image_bytes, image_hash)}},
                     ],
                 }
             ],
             temperature=0,
-            timeout=600
+            timeout=600,
+            extra_body=_KEEP_ALIVE_EXTRA_BODY,
         )
         content = response.choices[0].message.content.strip()
         logger.info("LLM markdown output (%d chars):\n%s", len(content), _preview_text(content))
+        llm_cache.set(cache_key, content)
         return content
     except Exception as exc:
         logger.exception("image->markdown failed: %s", exc)
@@ -248,7 +437,7 @@ def _parse_table_csv_to_subentities(csv_text: str, metadata: dict[str, Any] | No
                 continue
 
             detected_number, detected_unit = extract_numeric_and_unit(raw_val)
-            value_number, normalized_raw = _coerce_numeric_pair(raw_val, detected_number, default=0)
+            value_number, normalized_raw = coerce_numeric_pair(raw_val, detected_number, default=0)
             subentities.append(
                 {
                     "col": col,
@@ -327,7 +516,7 @@ def _normalize_indicator_values(indicators: list[dict[str, Any]]) -> list[dict[s
         if value_raw is None:
             value_raw = ""
 
-        value_number, normalized_raw = _coerce_numeric_pair(
+        value_number, normalized_raw = coerce_numeric_pair(
             value_raw,
             ind.get("value_number"),
             default=0,
@@ -376,7 +565,7 @@ def _extract_entities_from_openai_response(response_or_string) -> dict[str, Any]
 
         import json_repair
         try:
-            parsed = json.loads(content)
+            parsed = orjson.loads(content) if orjson is not None else json.loads(content)
         except Exception:
             parsed = json_repair.loads(content)
 
@@ -410,29 +599,51 @@ def _extract_entities_from_openai_response(response_or_string) -> dict[str, Any]
 
     
 def call_llm_markdown_to_json(markdown: str, image_bytes: bytes | None = None, promptype='markdown_to_json_prompt', schema_str: str | None = None) -> dict[str, Any]:
+    # With no markdown and no image there is nothing to extract from; skip
+    # the LLM round-trip entirely.
+    if not image_bytes and not (markdown or "").strip():
+        return {"screen_title": "", "entities": []}
+
     settings = _load_runtime_llm_settings()
     base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
     if not base_url:
         return {"screen_title": "", "entities": []}
     
-    client = OpenAI(
-        base_url=base_url,
-        api_key=settings["api_key"] or "no-key"
+    client = _get_llm_client(base_url, settings["api_key"] or "")
+
+    image_hash = _image_sha256(image_bytes) if image_bytes else None
+
+    # Check the cache before building the user content: on a hit after a
+    # restart the in-process data-URL LRU is cold, and the base64 encode
+    # would be paid for nothing.
+    cache_key = llm_cache.make_key(
+        kind="markdown_to_json",
+        model=settings["llm_model"],
+        system_prompt=settings[promptype],
+        schema=schema_str,
+        markdown=markdown,
+        image=image_hash,
+        temperature=0,
     )
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return _extract_entities_from_openai_response(cached)
 
     if image_bytes:
-        image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-        user_content = []
+        # Part order matters: the inference server's prefix cache reuses KV
+        # state for the longest unchanged leading span, so keep static and
+        # per-screen content (requirements, schema, image) ahead of the
+        # per-snapshot markdown.
+        user_content = [_NUMERIC_REQUIREMENTS_PART]
         if schema_str:
             user_content.append({"type": "text", "text": f"REQUIRED SCHEMA:\n{schema_str}"})
-        user_content.append({"type": "text", "text": NUMERIC_NON_LOG_REQUIREMENTS})
+        user_content.append({"type": "image_url", "image_url": {"url": _image_to_data_url(image_bytes, image_hash)}})
         user_content.append(
             {
                 "type": "text",
                 "text": f"MARKDOWN CONTENT:\n{markdown}" if markdown else "Extract from image and strictly follow REQUIRED SCHEMA.",
             }
         )
-        user_content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}})
     else:
         user_content = f"REQUIRED SCHEMA:\n{schema_str}\n\n{markdown}" if schema_str else markdown
 
@@ -444,9 +655,12 @@ def call_llm_markdown_to_json(markdown: str, image_bytes: bytes | None = None, p
                 {"role": "user", "content": user_content},
             ],
             temperature=0,
-            timeout=600
+            timeout=600,
+            extra_body=_KEEP_ALIVE_EXTRA_BODY,
         )
-        return _extract_entities_from_openai_response(response)
+        content = response.choices[0].message.content or ""
+        llm_cache.set(cache_key, content)
+        return _extract_entities_from_openai_response(content)
     except Exception as exc:
         logger.error("markdown->json failed: %s", exc)
         return {"entities": [], "_parse_error": str(exc)}
@@ -457,35 +671,47 @@ def call_llm_v2_extract(
     schema_str: str | None = None,
     schema_bootstrap: bool = False,
 ) -> dict[str, Any]:
+    if not image_bytes:
+        return {"screen_title": "", "entities": []}
+
     settings = _load_runtime_llm_settings()
     base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
     if not base_url:
         return {"screen_title": "", "entities": []}
 
-    client = OpenAI(
-        base_url=base_url,
-        api_key=settings["api_key"] or "no-key"
+    client = _get_llm_client(base_url, settings["api_key"] or "")
+
+    image_hash = _image_sha256(image_bytes)
+
+    # Check the cache before building the user content: on a hit after a
+    # restart the in-process data-URL LRU is cold, and the base64 encode
+    # would be paid for nothing.
+    cache_key = llm_cache.make_key(
+        kind="v2_extract",
+        model=settings["llm_model"],
+        system_prompt=settings.get("v2_extract_base_prompt", ""),
+        schema=schema_str,
+        layout=layout_text,
+        bootstrap=schema_bootstrap,
+        image=image_hash,
+        temperature=0,
     )
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return _extract_entities_from_openai_response(cached)
 
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-
+    # Static-first ordering for the server-side prefix cache: requirements
+    # and schema change rarely per screen group, the snapshot image and its
+    # OCR layout change every poll, so the dynamic parts go last.
     user_content: list[dict[str, Any]] = []
-    user_content.append({"type": "text", "text": NUMERIC_NON_LOG_REQUIREMENTS})
+    user_content.append(_NUMERIC_REQUIREMENTS_PART)
     if schema_bootstrap:
-        user_content.append(
-            {
-                "type": "text",
-                "text": (
-                    "SCHEMA BOOTSTRAP MODE: Infer stable entities and schema from the current screen first, "
-                    "then return current values using that inferred structure."
-                ),
-            }
-        )
+        user_content.append(_SCHEMA_BOOTSTRAP_PART)
     if schema_str:
         user_content.append({"type": "text", "text": f"MANDATORY SCHEMA TO FOLLOW:\n{schema_str}"})
+    user_content.append({"type": "image_url", "image_url": {"url": _image_to_data_url(image_bytes, image_hash)}})
     if layout_text:
         user_content.append({"type": "text", "text": f"SPATIAL TEXT LAYOUT (OCR):\n{layout_text}"})
-    user_content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}})
 
     messages = [
         {"role": "system", "content": settings.get("v2_extract_base_prompt", "")},
@@ -500,55 +726,161 @@ def call_llm_v2_extract(
             timeout=1200,
             stream=False,
             max_tokens=LLM_MAX_TOKENS,
+            extra_body=_KEEP_ALIVE_EXTRA_BODY,
         )
         final_content = response.choices[0].message.content or ""
         logger.info("Single-pass V2 extraction completed, output length=%d chars", len(final_content))
+        llm_cache.set(cache_key, final_content)
         return _extract_entities_from_openai_response(final_content)
     except Exception as exc:
         logger.error("v2 single-pass extract failed: %s", exc)
         return {"entities": [], "_parse_error": str(exc)}
 
+_SEGMENT_BATCH_INSTRUCTION = (
+    "You will receive multiple images. Apply the instructions above to each image "
+    "independently. For every image, output a line 'IMAGE <n>:' followed by its CSV, "
+    "keeping the order the images are given. Output nothing else."
+)
+
+
+def call_llm_segment_batch(
+    images: list[bytes],
+    seg_type: str,
+    columns: list[str] | None = None,
+    rows: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Extract several same-schema segment crops in one multi-image request.
+
+    All crops share one segment prompt, so sending them as separate image
+    parts of a single chat completion costs one round-trip instead of one
+    per segment. The model is asked to emit one 'IMAGE <n>:' CSV block per
+    crop; results come back in input order. A crop whose block is missing
+    gets a _parse_error entry so the caller can retry it individually.
+    """
+    if not images:
+        return []
+    if len(images) == 1:
+        return [call_llm_segment(images[0], seg_type, columns=columns, rows=rows)]
+
+    settings = _load_runtime_llm_settings()
+    base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
+    if not base_url:
+        return [{} for _ in images]
+
+    client = _get_llm_client(base_url, settings["api_key"] or "")
+
+    prompt_key = "v2_scada_prompt"
+    if seg_type == "fixed table":
+        prompt_key = "v2_fixed_table_prompt"
+    elif seg_type == "log tables":
+        prompt_key = "v2_log_table_prompt"
+
+    system_prompt = _format_segment_prompt(
+        settings.get(prompt_key, ""),
+        prompt_key,
+        tuple(columns or []),
+        tuple(rows or []),
+    )
+    system_prompt = f"{system_prompt}\n\n{_SEGMENT_BATCH_INSTRUCTION}"
+
+    image_hashes = [_image_sha256(image_bytes) for image_bytes in images]
+    cache_key = llm_cache.make_key(
+        kind="segment_batch",
+        model=settings["llm_model"],
+        system_prompt=system_prompt,
+        images=image_hashes,
+        temperature=0,
+    )
+    content = llm_cache.get(cache_key)
+
+    if content is None:
+        # Encode the crops only on a cache miss; a hit after restart would
+        # otherwise pay every base64 encode for nothing.
+        user_content: list[dict[str, Any]] = []
+        for idx, (image_bytes, image_hash) in enumerate(zip(images, image_hashes), start=1):
+            user_content.append({"type": "text", "text": f"IMAGE {idx}:"})
+            user_content.append({"type": "image_url", "image_url": {"url": _image_to_data_url(image_bytes, image_hash)}})
+
+        try:
+            response = client.chat.completions.create(
+                model=settings["llm_model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=0,
+                timeout=600,
+                max_tokens=4096 * len(images),
+                extra_body=_KEEP_ALIVE_EXTRA_BODY,
+            )
+            content = (response.choices[0].message.content or "").strip()
+            if content.startswith("```"):
+                content = re.sub(r"```(csv)?\n?", "", content)
+                content = re.sub(r"\n?```", "", content)
+            content = content.strip()
+            llm_cache.set(cache_key, content)
+        except Exception as exc:
+            logger.error("Batch segment LLM extraction failed (%s): %s", seg_type, exc)
+            return [{"_parse_error": str(exc)} for _ in images]
+
+    blocks: dict[int, str] = {}
+    parts = re.split(r"IMAGE\s+(\d+)\s*:", content)
+    for marker, block in zip(parts[1::2], parts[2::2]):
+        try:
+            blocks[int(marker)] = block.strip()
+        except ValueError:
+            continue
+
+    results: list[dict[str, Any]] = []
+    for idx in range(1, len(images) + 1):
+        block = blocks.get(idx)
+        if block is None:
+            results.append({"_parse_error": f"batch response missing block for image {idx}"})
+        else:
+            results.append({"raw_csv_table": block})
+    return results
+
+
 def call_llm_segment(
     image_bytes: bytes,
     seg_type: str,
     columns: list[str] | None = None,
     rows: list[str] | None = None,
 ) -> dict[str, Any]:
+    if not image_bytes:
+        return {}
+
     settings = _load_runtime_llm_settings()
     base_url = _normalize_openai_base_url(settings.get("llm_base_api", ""))
     if not base_url:
         return {}
 
-    client = OpenAI(
-        base_url=base_url,
-        api_key=settings["api_key"] or "no-key"
-    )
+    client = _get_llm_client(base_url, settings["api_key"] or "")
 
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-    
     prompt_key = "v2_scada_prompt"
     if seg_type == "fixed table":
         prompt_key = "v2_fixed_table_prompt"
     elif seg_type == "log tables":
         prompt_key = "v2_log_table_prompt"
     
-    system_prompt = settings.get(prompt_key, "")
-    if prompt_key == "v2_scada_prompt":
-        indicators_list = columns or []
-        csv_rows = "\n".join([f"{label}," for label in indicators_list])
-        system_prompt = system_prompt.format(
-            indicators=", ".join(indicators_list),
-            indicators_csv_rows=csv_rows
-        )
-    elif prompt_key == "v2_fixed_table_prompt":
-        col_header = ",".join(columns or [])
-        row_templates = "\n".join([f"{row_name}," for row_name in (rows or [])])
-        system_prompt = system_prompt.format(
-            columns=", ".join(columns or []),
-            rows=", ".join(rows or []),
-            columns_header=col_header,
-            rows_csv_template=row_templates
-        )
+    system_prompt = _format_segment_prompt(
+        settings.get(prompt_key, ""),
+        prompt_key,
+        tuple(columns or []),
+        tuple(rows or []),
+    )
+
+    image_hash = _image_sha256(image_bytes)
+    cache_key = llm_cache.make_key(
+        kind="segment",
+        model=settings["llm_model"],
+        system_prompt=system_prompt,
+        image=image_hash,
+        temperature=0,
+    )
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return {"raw_csv_table": cached}
 
     try:
         response = client.chat.completions.create(
@@ -558,21 +890,24 @@ def call_llm_segment(
                 {
                     "role": "user",
                     "content": [
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}},
+                        {"type": "image_url", "image_url": {"url": _image_to_data_url(image_bytes, image_hash)}},
                     ],
                 },
             ],
             temperature=0,
             timeout=300,
             max_tokens=4096,
+            extra_body=_KEEP_ALIVE_EXTRA_BODY,
         )
         content = response.choices[0].message.content.strip()
         # Remove markdown code blocks if the LLM hallucinated them
         if content.startswith("```"):
             content = re.sub(r"```(csv)?\n?", "", content)
             content = re.sub(r"\n?```", "", content)
-        
-        return {"raw_csv_table": content.strip()}
+
+        content = content.strip()
+        llm_cache.set(cache_key, content)
+        return {"raw_csv_table": content}
     except Exception as exc:
         logger.error("Segment LLM extraction failed (%s): %s", seg_type, exc)
         return {"_parse_error": str(exc)}
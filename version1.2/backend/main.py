@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import threading
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from cores.schema_mongo import ensure_indexes, get_db
 from cores.config import POLL_INTERVAL
 from cores.pipelines.pipeline_service_v2 import PipelineServiceV2
+from cores.services.llm_client import warm_up_llm
 from routers.api_v2 import router as api_v2_router
 from routers.config_router import ensure_config_document, router as config_router
 
@@ -83,6 +85,10 @@ async def startup_event():
             ]
         )
 
+    # Warm the LLM in the background so the first snapshot does not pay the
+    # model load; startup itself must not block on the inference server.
+    threading.Thread(target=warm_up_llm, name="llm-warmup", daemon=True).start()
+
     poll_stop.clear()
     poll_task = asyncio.create_task(pipeline_v2_service.poll_loop(db, poll_stop))
 
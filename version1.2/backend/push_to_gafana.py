@@ -1,4 +1,6 @@
 import os
+import threading
+
 from dotenv import load_dotenv
 from influxdb_client_3 import InfluxDBClient3, Point
 
@@ -9,6 +11,20 @@ TOKEN = (os.getenv("INFLUXDB_TOKEN") or "").strip()
 ORG = (os.getenv("INFLUXDB_ORG") or "").strip()
 BUCKET = (os.getenv("INFLUXDB_BUCKET") or "").strip()
 
+_client: InfluxDBClient3 | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> InfluxDBClient3:
+    """Reuse one InfluxDB client; opening a fresh connection per row makes
+    every dashboard push pay connection setup again."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InfluxDBClient3(host = URL, token = TOKEN, org = ORG)
+    return _client
+
 def insert_ocr_result(screen_id: str, area_id: str, type_value: str, ocr_value: str) -> None:
     """Insert one row into ip_kvm in InfluxDB.
     Tags: 画面ID, エリアID, type_value (identifiers, used for filtering/grouping)
@@ -27,9 +43,8 @@ def insert_ocr_result(screen_id: str, area_id: str, type_value: str, ocr_value:
         .field("OCR", ocr_value)
     )
 
-    with InfluxDBClient3(host = URL, token = TOKEN, org = ORG) as client:
-        client.write(database = BUCKET, record = point)
-        print(f"OK — wrote OCR={ocr_value} (type={type_value}) for 画面ID={screen_id}, エリアID={area_id}")
+    _get_client().write(database = BUCKET, record = point)
+    print(f"OK — wrote OCR={ocr_value} (type={type_value}) for 画面ID={screen_id}, エリアID={area_id}")
 
 if __name__ == "__main__":
     insert_ocr_result("1", "1", "number", "0.0") # screen_id, area_id, type_value, ocr_value
\ No newline at end of file
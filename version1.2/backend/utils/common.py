@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
+from typing import Any
 
 
 def now_utc() -> datetime:
@@ -84,3 +86,49 @@ def clean_numeric_value(value: str | None) -> float | None:
         return pn
     num, _ = extract_numeric_and_unit(value)
     return num
+
+
+def normalize_numeric_scalar(value: Any) -> int | float | None:
+    """Coerce an extracted value to a finite int/float, mapping boolean
+    states (ON/OFF, RUN/STOP, ...) to 1/0. Returns None when the value has
+    no numeric interpretation."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 1 if value else 0
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        f_val = float(value)
+        if not math.isfinite(f_val):
+            return None
+        return int(f_val) if f_val.is_integer() else f_val
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    lowered = text.lower()
+    if lowered == "on" or lowered in _BOOL_TRUE_VALUES:
+        return 1
+    if lowered == "off" or lowered in _BOOL_FALSE_VALUES:
+        return 0
+
+    parsed = clean_numeric_value(text)
+    if parsed is None:
+        return None
+
+    parsed_f = float(parsed)
+    if not math.isfinite(parsed_f):
+        return None
+    return int(parsed_f) if parsed_f.is_integer() else parsed_f
+
+
+def coerce_numeric_pair(raw_value: Any, explicit_number: Any = None, default: float = 0.0) -> tuple[int | float, str]:
+    """Resolve (value_number, value_raw) from a raw value and an optional
+    explicit number, falling back to the given default."""
+    for candidate in (explicit_number, raw_value):
+        number = normalize_numeric_scalar(candidate)
+        if number is not None:
+            return number, str(number)
+
+    fallback = int(default) if float(default).is_integer() else float(default)
+    return fallback, str(fallback)
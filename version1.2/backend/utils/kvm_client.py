@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from io import BytesIO
 
@@ -171,12 +172,31 @@ def fetch_snapshot_bytes(source: dict, monitor_key: str | None = None) -> bytes
         _post(session, f"{base_url}/disconnect", timeout=5)
 
 
+_external_session: requests.Session | None = None
+_external_session_lock = threading.Lock()
+
+
+def _get_external_session() -> requests.Session:
+    """Lazily create one shared session for external requests.
+
+    ``requests.request`` opens and tears down a connection per call; a
+    module-level session keeps the pool alive so repeated calls to the same
+    host reuse sockets.
+    """
+    global _external_session
+    if _external_session is None:
+        with _external_session_lock:
+            if _external_session is None:
+                _external_session = requests.Session()
+    return _external_session
+
+
 # kept for llm_client.py compatibility
 def request_with_log(method: str, url: str, **kwargs) -> requests.Response | None:
     try:
         timeout = kwargs.pop("timeout", 60)
         logger.info("External Req: %s %s (timeout=%s)", method, url, timeout)
-        r = requests.request(method, url, timeout=timeout, **kwargs)
+        r = _get_external_session().request(method, url, timeout=timeout, **kwargs)
         logger.info("External Res: %s %s → %s", method, url, r.status_code)
         return r
     except Exception as e:
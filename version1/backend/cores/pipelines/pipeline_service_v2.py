@@ -121,7 +121,7 @@ class PipelineServiceV2(pipeline_service.PipelineService):
                 logger.info("Using existing entity_schema for LLM extraction.")
 
             # OCR + Information extraction with LLM
-            layout_text = ocr.generate_layout_text(str(saved_path))
+            layout_text = ocr.generate_layout_text(image_bytes)
             extracted_json = call_llm_v2_extract(image_bytes, layout_text, schema_str)
 
             raw_llm_json_response = extracted_json.get("_raw_response") if isinstance(extracted_json, dict) else None
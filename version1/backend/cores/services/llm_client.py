@@ -1,9 +1,10 @@
+import asyncio
 import base64
 import json
 import logging
 import re
 from typing import Any
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from cores.config import API_KEY, LLM_BASEAPI, LLM_MODEL, LLM_MAX_TOKENS
 from cores.dbconnection.mongo import get_db
@@ -245,60 +246,45 @@ def call_llm_v2_extract(image_bytes: bytes, layout_text: str, schema_str: str |
     )
 
     image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-    
-    import concurrent.futures
 
-    # TASK 1: INITIAL EXTRACTION (without OCR layout)
-    def task_image_only():
-        user_content = []
-        if schema_str:
-            user_content.append({"type": "text", "text": f"MANDATORY SCHEMA TO FOLLOW:\n{schema_str}"})
-        user_content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}})
-        messages = [
-            {"role": "system", "content": settings.get("v2_extract_base_prompt", "")},
-            {"role": "user", "content": user_content},
-        ]
-        response = client.chat.completions.create(
-            model=settings["llm_model"],
-            messages=messages,
-            temperature=0,
-            timeout=1200, 
-            stream=False,  
-            max_tokens=LLM_MAX_TOKENS
+    # STEP 1: two independent extractions (image only vs image + OCR layout),
+    # awaited on one event loop instead of burning two pool threads that just
+    # block on network I/O.
+    async def _run_parallel_extractions():
+        async_client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=settings["api_key"] or "no-key"
         )
-        return response.choices[0].message.content
 
-    # TASK 2: EXTRACTION (with OCR layout)
-    def task_image_and_ocr():
-        user_content = []
-        if schema_str:
-            user_content.append({"type": "text", "text": f"MANDATORY SCHEMA TO FOLLOW:\n{schema_str}"})
-        if layout_text:
-            user_content.append({"type": "text", "text": f"SPATIAL TEXT LAYOUT (OCR):\n{layout_text}"})
-        user_content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}})
-        messages = [
-            {"role": "system", "content": settings.get("v2_extract_base_prompt", "")},
-            {"role": "user", "content": user_content},
-        ]
-        response = client.chat.completions.create(
-            model=settings["llm_model"],
-            messages=messages,
-            temperature=0,
-            timeout=1200, 
-            stream=False,  
-            max_tokens=LLM_MAX_TOKENS
-        )
-        return response.choices[0].message.content
+        async def extract(include_layout: bool):
+            user_content = []
+            if schema_str:
+                user_content.append({"type": "text", "text": f"MANDATORY SCHEMA TO FOLLOW:\n{schema_str}"})
+            if include_layout and layout_text:
+                user_content.append({"type": "text", "text": f"SPATIAL TEXT LAYOUT (OCR):\n{layout_text}"})
+            user_content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}})
+            messages = [
+                {"role": "system", "content": settings.get("v2_extract_base_prompt", "")},
+                {"role": "user", "content": user_content},
+            ]
+            response = await async_client.chat.completions.create(
+                model=settings["llm_model"],
+                messages=messages,
+                temperature=0,
+                timeout=1200, 
+                stream=False,  
+                max_tokens=LLM_MAX_TOKENS
+            )
+            return response.choices[0].message.content
+
+        try:
+            return await asyncio.gather(extract(False), extract(True))
+        finally:
+            await async_client.close()
 
     try:
         logger.info("Starting Step 1: Parallel Extractions (Image Only vs Image + OCR)...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            future_img = executor.submit(task_image_only)
-            future_ocr = executor.submit(task_image_and_ocr)
-            
-            output_a = future_img.result()
-            output_b = future_ocr.result()
-            
+        output_a, output_b = asyncio.run(_run_parallel_extractions())
         logger.info("Step 1 Complete. Output A length: %d chars, Output B length: %d chars", len(output_a or ""), len(output_b or ""))
         
         # STEP 2: MERGE
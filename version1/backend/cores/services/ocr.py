@@ -1,5 +1,6 @@
 from paddleocr import PaddleOCR
 import threading, cv2, unicodedata
+import numpy as np
 paddle_ocr_model = PaddleOCR(
     text_detection_model_name="PP-OCRv5_mobile_det",
     text_recognition_model_name="PP-OCRv5_mobile_rec",
@@ -9,53 +10,84 @@ paddle_ocr_model = PaddleOCR(
 )
 paddle_lock = threading.Lock()
 
-def generate_layout_text(image_path: str) -> str:
+def _result_texts_and_boxes(res) -> tuple[list, list]:
+    """Read rec_texts/rec_boxes straight off the prediction result.
+
+    Newer paddleocr results expose their payload via the .json property (and
+    dict-style access), so there is no need to round-trip through a temp JSON
+    directory on every call.
+    """
+    data = getattr(res, "json", None)
+    if isinstance(data, dict):
+        inner = data.get("res")
+        if isinstance(inner, dict):
+            data = inner
+        texts = data.get("rec_texts")
+        boxes = data.get("rec_boxes")
+        if texts is not None and boxes is not None:
+            return list(texts), list(boxes)
+    try:
+        return list(res["rec_texts"]), list(res["rec_boxes"])
+    except Exception:
+        return [], []
+
+
+def _result_texts_and_boxes_via_tempfile(res) -> tuple[list, list]:
+    # Fallback for result objects that only support save_to_json.
+    import tempfile, uuid, os, json, shutil
+    tmp_dir = os.path.join(tempfile.gettempdir(), f"ocr_tmp_{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    try:
+        res.save_to_json(tmp_dir)
+        json_files = [f for f in os.listdir(tmp_dir) if f.endswith('.json')]
+        if not json_files:
+            return [], []
+
+        with open(os.path.join(tmp_dir, json_files[0]), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        return data.get("rec_texts", []), data.get("rec_boxes", [])
+    except Exception as e:
+        print(f"Failed to read OCR output via JSON: {e}")
+        return [], []
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def generate_layout_text(image_source: str | bytes) -> str:
     if not paddle_ocr_model:
         return ""
-    
+
     try:
-        # We use cv2 imread directly from the saved image to avoid memory format issues
-        image = cv2.imread(image_path)
-        
+        # Accept raw snapshot bytes so callers holding the image in memory
+        # do not have to write it to disk just to re-read it here.
+        if isinstance(image_source, (bytes, bytearray)):
+            image = cv2.imdecode(np.frombuffer(image_source, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            image = cv2.imread(image_source)
+
         if paddle_lock:
             with paddle_lock:
                 output = paddle_ocr_model.predict(input=image)
         else:
             output = paddle_ocr_model.predict(input=image)
-            
+
         if not output or not output[0]:
             return ""
-        
+
         res = output[0]
-        
-        # Save to temp JSON to avoid issues with numpy arrays or complex internal objects
-        import tempfile, uuid, os, json, shutil
-        tmp_dir = os.path.join(tempfile.gettempdir(), f"ocr_tmp_{uuid.uuid4().hex}")
-        os.makedirs(tmp_dir, exist_ok=True)
-        
-        try:
-            res.save_to_json(tmp_dir)
-            json_files = [f for f in os.listdir(tmp_dir) if f.endswith('.json')]
-            if not json_files:
-                return ""
-            
-            with open(os.path.join(tmp_dir, json_files[0]), 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            texts = data.get("rec_texts", [])
-            boxes = data.get("rec_boxes", [])
-        except Exception as e:
-            print(f"Failed to read OCR output via JSON: {e}")
-            return ""
-        finally:
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-        
+
+        texts, boxes = _result_texts_and_boxes(res)
+        if not texts or not boxes:
+            texts, boxes = _result_texts_and_boxes_via_tempfile(res)
+
         if not texts or not boxes:
             return ""
-            
+
         max_x = max([box[2] for box in boxes])
         max_y = max([box[3] for box in boxes])
-        
+
         items = []
         for txt, box in zip(texts, boxes):
             items.append({
@@ -88,7 +120,7 @@ def generate_layout_text(image_path: str) -> str:
         def get_char_width(c):
             return 2 if unicodedata.east_asian_width(c) in ('F', 'W', 'A') else 1
 
-        visual_width = 300 
+        visual_width = 300
         height_lines = int((max_y / max_x) * visual_width * 0.5) if max_x > 0 else 50
         lines_dict = {y: {} for y in range(height_lines + 1)}
 
@@ -117,9 +149,9 @@ def generate_layout_text(image_path: str) -> str:
                 line_str += char
                 current_x += get_char_width(char)
             layout_lines.append(line_str.rstrip())
-            
+
         return "\n".join(layout_lines)
-        
+
     except Exception as e:
         print("OCR layout generation failed:", e)
         return ""